@@ -1,4 +1,9 @@
 # src/__init__.py
+import logging
+
 from .api import CoinGeckoAPIClient
 from .storage import LocalStorage
-from .data_operations import DataProcessing
\ No newline at end of file
+from .data_operations import DataProcessing
+
+# Log records are only emitted once the application configures logging
+logging.getLogger(__name__).addHandler(logging.NullHandler())
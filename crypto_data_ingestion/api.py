@@ -1,10 +1,13 @@
-import os
+import json
+import shelve
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
-from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-#Load environment variables
-load_dotenv()
+from .config import get_env
 
 
 class CoinGeckoAPIClient:
@@ -12,24 +15,52 @@ class CoinGeckoAPIClient:
     An interface to interact with the CoinGecko data API.
 
     This class contains methods to make HTTP requests using the 'Requests' library through the 'GET' action on the CoinGecko API.
+    Requests share a pooled session, so connections are reused across calls and transient errors are retried.
 
     Attributes:
         base_url (str): The base URL of the CoinGecko API.
         headers (dict): The HTTP request headers containing information such as authentication and content type.
+        session (requests.Session): The pooled HTTP session used to send the requests.
+        max_workers (int): The number of threads used to send concurrent requests.
+        cache_path (str | None): The file the ETag cache is persisted to. If None, the cache is kept in memory only.
     """
 
-    def __init__(self):
-        self.base_url: str = os.getenv('COINGECKO_API_URL')
+    def __init__(
+        self,
+        pool_size: int = 32,
+        max_workers: int = 16,
+        cache_path: str | None = None,
+    ):
+        self.base_url: str = get_env('COINGECKO_API_URL')
         if not self.base_url:
             raise ValueError('Coingecko API URL not set in config.yaml')
         self.headers: dict = {
             'Content-Type': 'application/json',
         }
+        self.max_workers: int = max_workers
+        self.session: requests.Session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(
+                total=5,
+                backoff_factor=0.5,
+                status_forcelist=[429, 502, 503, 504],
+            ),
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.cache_path: str | None = cache_path
+        self._etag_cache = shelve.open(cache_path) if cache_path else {}
+        self._cache_lock = threading.Lock()
 
     def get_data(self, endpoint: str, params: dict = None) -> dict:
         """
         Sends a GET request to the API endpoint.
 
+        If a previous response for the same URL carried an ETag, the request is sent with 'If-None-Match'
+        and the cached JSON body is decoded again when the API answers '304 Not Modified'.
+
         Parameters:
             endpoint (str): The API endpoint you want to query.
             params (dict, optional): The query parameters you want to execute. Defaults to None.
@@ -41,11 +72,47 @@ class CoinGeckoAPIClient:
             requests.exceptions.RequestException: If there is an issue with the HTTP request.
         """
         url = f'{self.base_url}/{endpoint}'
+        cache_key = requests.Request('GET', url, params=params).prepare().url
+        with self._cache_lock:
+            cached = self._etag_cache.get(cache_key)
+        headers = self.headers
+        if cached:
+            headers = {**self.headers, 'If-None-Match': cached[0]}
         try:
-            response = requests.get(url, headers=self.headers, params=params)
-            return self._handle_response(response)
+            response = self.session.get(url, headers=headers, params=params)
+            if cached and response.status_code == 304:
+                # The raw body is cached, so each hit decodes a fresh copy callers can mutate
+                return json.loads(cached[1])
+            data = self._handle_response(response)
         except requests.exceptions.RequestException as e:
             raise SystemExit(e)
+        etag = response.headers.get('ETag')
+        if etag:
+            with self._cache_lock:
+                self._etag_cache[cache_key] = (etag, response.content)
+        return data
+
+    def get_data_many(
+        self, endpoints: list[tuple[str, dict | None]]
+    ) -> list[dict]:
+        """
+        Sends concurrent GET requests to several API endpoints.
+
+        Parameters:
+            endpoints (list[tuple[str, dict | None]]): The endpoints you want to query, each paired with its query parameters.
+
+        Returns:
+            list[dict]: The JSON responses from the API, in the same order as the endpoints.
+
+        Raises:
+            requests.exceptions.RequestException: If there is an issue with any of the HTTP requests.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(self.get_data, endpoint, params)
+                for endpoint, params in endpoints
+            ]
+            return [future.result() for future in futures]
 
     def _handle_response(self, response: requests.Response) -> dict:
         """
@@ -68,3 +135,12 @@ class CoinGeckoAPIClient:
             return response.json()
         else:
             response.raise_for_status()
+
+    def close(self) -> None:
+        """
+        Closes the HTTP session and flushes the ETag cache to disk, if it is persisted.
+        """
+        self.session.close()
+        if self.cache_path:
+            with self._cache_lock:
+                self._etag_cache.close()
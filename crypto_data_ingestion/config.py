@@ -0,0 +1,29 @@
+import os
+from functools import lru_cache
+
+from dotenv import load_dotenv
+
+
+@lru_cache(maxsize=None)
+def load_env() -> None:
+    """
+    Loads the environment variables from the '.env' file.
+
+    The file is only read on the first call, later calls are no-ops.
+    """
+    load_dotenv()
+
+
+def get_env(name: str, default: str | None = None) -> str | None:
+    """
+    Gets an environment variable, loading the '.env' file first if it has not been loaded yet.
+
+    Parameters:
+        name (str): The name of the environment variable.
+        default (str, optional): The value returned if the variable is not set. Defaults to None.
+
+    Returns:
+        str | None: The value of the environment variable, or the default.
+    """
+    load_env()
+    return os.getenv(name, default)
@@ -1,50 +1,380 @@
 import logging
+import math
 import os
+import re
+import threading
+from functools import cached_property
 
 import duckdb
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from pyarrow.fs import S3FileSystem
 
-from deltalake import DeltaTable, write_deltalake
-from dotenv import load_dotenv
+from deltalake import DeltaTable, WriterProperties, write_deltalake
+from .config import get_env
 from .storage import LocalStorage, StorageInterface
 
-# Configure the logger with timestamp
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S',
-)
 logger = logging.getLogger(__name__)
 
-#Load environment variables
-load_dotenv()
+# Parquet settings used for every Delta write
+DELTA_WRITER_PROPERTIES = WriterProperties(
+    compression='ZSTD', data_page_size_limit=1 << 20
+)
+DELTA_TARGET_FILE_SIZE = 128 << 20
+
+# DuckDB table functions reading each supported file extension
+FILE_READERS = {
+    'csv': 'read_csv',
+    'parquet': 'read_parquet',
+    'json': 'read_json',
+}
+
+# Identifiers accepted for the tables, views and columns interpolated in SQL
+IDENTIFIER_PATTERN = re.compile(r'[A-Za-z_][A-Za-z0-9_]{0,62}')
+
+# Connections shared by the process, by database path
+_connections: dict[str, duckdb.DuckDBPyConnection] = {}
+_connections_lock = threading.Lock()
+
+
+def _validate_identifier(name: str) -> str:
+    """
+    Checks that a name is a plain SQL identifier, so it can be safely interpolated in a query.
+
+    Raises:
+        ValueError: If the name is not a valid identifier.
+    """
+    if not IDENTIFIER_PATTERN.fullmatch(name):
+        logger.error("Invalid identifier '%s' provided.", name)
+        raise ValueError(
+            f"Invalid identifier '{name}'. Identifiers must start with a letter or underscore and contain only letters, digits and underscores."
+        )
+    return name
+
+
+def _file_reader(file_extension: str) -> str:
+    """
+    Gets the name of the DuckDB reader for a file extension.
+
+    Raises:
+        ValueError: If the file extension is not supported.
+    """
+    reader = FILE_READERS.get(file_extension)
+    if reader is None:
+        logger.error('Invalid file extension provided.')
+        raise ValueError(
+            'Invalid file extension. Please provide a valid file extension. Supported file extensions are: csv, parquet, json'
+        )
+    return reader
+
+
+def _prefix_glob(bucket_name: str, prefix: str, file_extension: str) -> str:
+    """
+    Builds the glob matching every file with the given extension under a bucket prefix, searched recursively.
+    """
+    folder = prefix.strip('/')
+    if folder:
+        folder += '/'
+    return f's3://{bucket_name}/{folder}**/*.{file_extension}'
+
+
+def _sql_literal(value) -> str:
+    """
+    Formats a Python value as a SQL literal, quoting strings, dates and timestamps.
+    """
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, float) and not math.isfinite(value):
+        # NaN and infinities have no literal form, they are cast from strings
+        return f"CAST('{value}' AS DOUBLE)"
+    if isinstance(value, (int, float)):
+        return str(value)
+    escaped = str(value).replace("'", "''")
+    return f"'{escaped}'"
+
+
+def _merge_predicate(
+    data: pa.Table, keys: list[str], partition_cols: list[str]
+) -> str:
+    """
+    Builds the predicate of a Delta merge between the target 't' and the source 's'.
+
+    Rows match on the key columns, and the target is restricted to the partition values present in the source.
+    """
+    predicates = [
+        f't."{key}" = s."{key}"' for key in map(_validate_identifier, keys)
+    ]
+    for column in map(_validate_identifier, partition_cols):
+        values = pc.unique(data[column]).to_pylist()
+        literals = ', '.join(
+            _sql_literal(value) for value in values if value is not None
+        )
+        predicate = f't."{column}" IN ({literals})' if literals else 'false'
+        if None in values:
+            predicate = f'({predicate} OR t."{column}" IS NULL)'
+        predicates.append(predicate)
+    return ' AND '.join(predicates)
+
+
+def _write_row_groups(
+    writer: pq.ParquetWriter,
+    reader: pa.RecordBatchReader,
+    row_group_size: int,
+):
+    """
+    Writes record batches to a Parquet file in row groups of row_group_size rows, so small batches are not each written as a row group.
+
+    At most one row group plus one batch is buffered in memory.
+    """
+    buffered, buffered_rows = [], 0
+    for batch in reader:
+        buffered.append(batch)
+        buffered_rows += batch.num_rows
+        if buffered_rows >= row_group_size:
+            table = pa.Table.from_batches(buffered, reader.schema)
+            full_rows = buffered_rows - buffered_rows % row_group_size
+            writer.write_table(
+                table.slice(0, full_rows), row_group_size=row_group_size
+            )
+            buffered = table.slice(full_rows).to_batches()
+            buffered_rows -= full_rows
+    if buffered_rows:
+        writer.write_table(
+            pa.Table.from_batches(buffered, reader.schema),
+            row_group_size=row_group_size,
+        )
+
+
+def shared_connection(
+    db_path: str | None = None,
+    threads: int | None = None,
+    memory_limit: str | None = None,
+    temp_directory: str | None = None,
+    preserve_insertion_order: bool | None = None,
+) -> duckdb.DuckDBPyConnection:
+    """
+    Gets the DuckDB connection shared by the process for a database, creating it on the first call.
+
+    The settings are database-wide and are applied on every call, so the latest values apply to every
+    instance sharing the database. Settings left as None keep their current value.
+
+    Parameters:
+        db_path (str, optional): The path to a DuckDB database file, so persisted tables are kept between runs.
+            Defaults to None, which uses an in-memory database.
+        threads (int, optional): The number of threads DuckDB may use. Defaults to None, which uses all cores.
+        memory_limit (str, optional): The maximum memory DuckDB may use, e.g. '4GB'. Defaults to None, which uses DuckDB's default.
+        temp_directory (str, optional): The directory DuckDB spills to when a query exceeds the memory limit.
+            Defaults to None, which uses DuckDB's default.
+        preserve_insertion_order (bool, optional): Whether query results without an ORDER BY keep the insertion order.
+            Disabling it reduces memory usage on large scans. Defaults to None, which keeps the current value,
+            False for a newly opened database.
+
+    Returns:
+        duckdb.DuckDBPyConnection: The shared DuckDB connection.
+    """
+    connection = _connect(_database_name(db_path))
+    settings = {
+        'threads': threads,
+        'memory_limit': memory_limit,
+        'temp_directory': temp_directory,
+        'preserve_insertion_order': preserve_insertion_order,
+    }
+    # The parent connection is shared across threads, so it is only used to create cursors
+    cursor = connection.cursor()
+    try:
+        for name, value in settings.items():
+            if value is not None:
+                cursor.execute(f'SET {name} = ?', [value])
+    finally:
+        cursor.close()
+    return connection
+
+
+def _database_name(db_path: str | None) -> str:
+    """
+    Normalizes a database path so the same database always maps to the same shared connection.
+
+    In-memory names, ':memory:' and ':memory:<name>', are not paths and are kept unchanged.
+    """
+    if not db_path:
+        return ':memory:'
+    if db_path.startswith(':memory:'):
+        return db_path
+    return os.path.abspath(db_path)
+
+
+def _connect(db_path: str) -> duckdb.DuckDBPyConnection:
+    """
+    Gets the connection to a DuckDB database, opening it on the first call.
+
+    The lock makes concurrent first calls, e.g. from a thread pool, share a single database.
+    """
+    with _connections_lock:
+        connection = _connections.get(db_path)
+        if connection is None:
+            connection = _open_database(db_path)
+            _connections[db_path] = connection
+    return connection
+
+
+def _open_database(db_path: str) -> duckdb.DuckDBPyConnection:
+    """
+    Opens a DuckDB database and sets up its extensions and MinIO secret.
+    """
+    connection = duckdb.connect(db_path)
+    # Set once on open, so a later instance leaving it as None keeps an explicit True
+    connection.execute('SET preserve_insertion_order = false')
+    if db_path.startswith(':memory:'):
+        logger.info('DuckDB in-memory database connected.')
+    else:
+        logger.info('DuckDB database connected at %s.', db_path)
+    # The extensions are optional, local Parquet, Delta and SQL work without them
+    if _load_extension(connection, 'httpfs'):
+        _configure_object_storage(connection)
+    else:
+        logger.warning(
+            'DuckDB extension httpfs not loaded, S3 access from DuckDB is disabled.'
+        )
+    _load_extension(connection, 'delta')
+    return connection
+
+
+def _load_extension(
+    connection: duckdb.DuckDBPyConnection, extension: str
+) -> bool:
+    """
+    Loads a DuckDB extension, installing it only if it is not installed yet.
+
+    Returns:
+        bool: True if the extension is loaded, False if it could not be installed (e.g. while offline).
+    """
+    try:
+        connection.execute(f'LOAD {extension}')
+    except duckdb.IOException:
+        try:
+            connection.execute(f'INSTALL {extension}')
+            connection.execute(f'LOAD {extension}')
+        except duckdb.IOException as e:
+            logger.warning(
+                'DuckDB extension %s could not be installed: %s', extension, e
+            )
+            return False
+    logger.info('DuckDB extension %s loaded.', extension)
+    return True
+
+
+def _configure_object_storage(connection: duckdb.DuckDBPyConnection):
+    """
+    Registers the MinIO credentials as an S3 secret, so DuckDB can stream objects directly from 's3://' paths.
+    """
+    endpoint = get_env('MINIO_ENDPOINT')
+    access_key = get_env('MINIO_ACCESS_KEY')
+    secret_key = get_env('MINIO_SECRET_KEY')
+    if not endpoint:
+        logger.warning(
+            'MinIO endpoint not set, S3 access from DuckDB is disabled.'
+        )
+        return
+    if not access_key or not secret_key:
+        logger.warning(
+            'MinIO credentials not set, S3 access from DuckDB is disabled.'
+        )
+        return
+    connection.execute(
+        f"""
+        CREATE OR REPLACE SECRET minio (
+            TYPE S3,
+            KEY_ID {_sql_literal(access_key)},
+            SECRET {_sql_literal(secret_key)},
+            ENDPOINT {_sql_literal(endpoint)},
+            URL_STYLE 'path',
+            USE_SSL false
+        )
+        """
+    )
+    logger.info('DuckDB httpfs configured for MinIO Storage.')
 
 
 class DataProcessing:
     """
     A class used to process data using DuckDB and Delta Lake.
 
+    Instances share one DuckDB database per process, each working on its own cursor. Persisted tables are
+    visible to every instance, while registered data, materialized tables and Delta views are temporary and
+    local to the instance that created them.
+
     Attributes:
-        connector (duckdb.DuckDBPyConnection): A connection to an in-memory DuckDB database.
-        cursor (duckdb.DuckDBPyConnection.cursor): A cursor for executing SQL queries on the DuckDB connection.
+        connection (duckdb.DuckDBPyConnection): The DuckDB connection shared with the other instances.
+        connector (duckdb.DuckDBPyConnection): The cursor of this instance on the shared connection.
+        cursor (duckdb.DuckDBPyConnection): An alias of 'connector', kept for backwards compatibility.
+        storage (StorageInterface): The object storage the raw data is stored in.
     """
 
-    def __init__(self, storage: StorageInterface):
+    def __init__(
+        self,
+        storage: StorageInterface,
+        db_path: str | None = None,
+        threads: int | None = None,
+        memory_limit: str | None = None,
+        temp_directory: str | None = None,
+        preserve_insertion_order: bool | None = None,
+        connection: duckdb.DuckDBPyConnection | None = None,
+    ):
         """
-        Initializes the DataProcessing class by creating an in-memory DuckDB connection and cursor.
+        Initializes the DataProcessing class with a cursor on a shared DuckDB connection.
+
+        Parameters:
+            storage (StorageInterface): The object storage the raw data is stored in.
+            db_path (str, optional): The path to a DuckDB database file, so persisted tables are kept between runs.
+                Defaults to None, which uses an in-memory database.
+            threads (int, optional): The number of threads DuckDB may use. Defaults to None, which uses all cores.
+            memory_limit (str, optional): The maximum memory DuckDB may use, e.g. '4GB'. Defaults to None, which uses DuckDB's default.
+            temp_directory (str, optional): The directory DuckDB spills to when a query exceeds the memory limit.
+                Defaults to None, which uses DuckDB's default.
+            preserve_insertion_order (bool, optional): Whether query results without an ORDER BY keep the insertion order.
+                Disabling it reduces memory usage on large scans. Defaults to None, which keeps the current value,
+                False for a newly opened database.
+            connection (duckdb.DuckDBPyConnection, optional): The DuckDB connection to be used, in which case the settings
+                above are ignored and the connection is expected to have the httpfs and delta extensions loaded.
+                Defaults to None, which uses the connection shared by the process for the database above.
         """
-        self.connector = duckdb.connect(':memory:')
-        self.cursor = self.connector.cursor()
+        if connection is None:
+            connection = shared_connection(
+                db_path,
+                threads,
+                memory_limit,
+                temp_directory,
+                preserve_insertion_order,
+            )
+        self.connection = connection
+        self.connector = connection.cursor()
+        self.cursor = self.connector
         self.storage = storage
-        logger.info('DuckDB in-memory database connected.')
+
+    @cached_property
+    def _s3_filesystem(self) -> S3FileSystem:
+        """
+        The MinIO Storage as an Arrow filesystem, used to write Parquet files to 's3://' paths.
+        """
+        return S3FileSystem(
+            access_key=get_env('MINIO_ACCESS_KEY'),
+            secret_key=get_env('MINIO_SECRET_KEY'),
+            endpoint_override=get_env('MINIO_ENDPOINT'),
+            scheme='http',
+        )
 
     ## Reader
 
     def read_raw_data(
         self, file_extension: str, bucket_name: str, file_path: str
-    ) -> pd.DataFrame:
+    ) -> pa.Table:
         """
-        Reads raw data from a file into a DuckDB table.
+        Reads raw data from a file into an Arrow table.
+
+        The file is streamed by DuckDB straight from the object storage through the httpfs extension,
+        without buffering the whole object in memory first.
 
         Parameters:
             file_extension (str): The file extension of the raw data file. Supported extensions are 'csv', 'parquet', and 'json'.
@@ -52,45 +382,110 @@ class DataProcessing:
             file_path (str): The path to the raw data file.
 
         Returns:
-            pd.DataFrame: A DataFrame containing the data from the file.
+            pa.Table: An Arrow table containing the data from the file.
 
         Raises:
             ValueError: If the file extension is not supported.
         """
         logger.info(
-            f'Reading raw data from {bucket_name}/{file_path} with extension {file_extension}.'
+            'Reading raw data from %s/%s with extension %s.',
+            bucket_name,
+            file_path,
+            file_extension,
         )
-        response = self.storage.get_object_data(bucket_name, file_path)
+        reader = getattr(self.connector, _file_reader(file_extension))
+        table = reader(f's3://{bucket_name}/{file_path}').arrow()
 
-        if file_extension == 'csv':
-            df = duckdb.read_csv(response).df()
-        elif file_extension == 'parquet':
-            df = duckdb.read_parquet(response).df()
-        elif file_extension == 'json':
-            df = duckdb.read_json(response).df()
-        else:
-            logger.error('Invalid file extension provided.')
-            raise ValueError(
-                'Invalid file extension. Please provide a valid file extension. Supported file extensions are: csv, parquet, json'
-            )
+        logger.info(
+            'Data read successfully from %s/%s.', bucket_name, file_path
+        )
+        return table
+
+    def read_prefix(
+        self, file_extension: str, bucket_name: str, prefix: str
+    ) -> pa.Table:
+        """
+        Reads every file with the given extension under a bucket prefix into a single Arrow table.
 
-        logger.info(f'Data read successfully from {bucket_name}/{file_path}.')
-        return df
+        The files are matched with a glob and decoded by DuckDB in one parallel scan. Columns are
+        unified by name across files, and Hive-style partition folders (e.g. 'date=2024-10-01') are read as columns.
 
-    def read_delta_table(self, table_path: str) -> pd.DataFrame:
+        Parameters:
+            file_extension (str): The file extension of the raw data files. Supported extensions are 'csv', 'parquet', and 'json'.
+            bucket_name (str): The name of the bucket where the files are stored.
+            prefix (str): The folder the files are stored in, searched recursively. An empty prefix reads the whole bucket.
+
+        Returns:
+            pa.Table: An Arrow table containing the data from all the files.
+
+        Raises:
+            ValueError: If the file extension is not supported.
+        """
+        logger.info(
+            'Reading raw data from %s/%s with extension %s.',
+            bucket_name,
+            prefix,
+            file_extension,
+        )
+        reader = _file_reader(file_extension)
+        glob_uri = _prefix_glob(bucket_name, prefix, file_extension)
+        table = self.connector.execute(
+            f'SELECT * FROM {reader}(?, union_by_name = true, hive_partitioning = true)',
+            [glob_uri],
+        ).fetch_arrow_table()
+        logger.info('Data read successfully from %s/%s.', bucket_name, prefix)
+        return table
+
+    def read_delta_table(
+        self,
+        table_path: str,
+        columns: list[str] | None = None,
+        filters: list[tuple] | None = None,
+        version: int | None = None,
+    ) -> pa.Table:
         """
-        Reads a Delta table into a Pandas DataFrame.
+        Reads a Delta table into an Arrow table.
+
+        The column selection and filters are pushed down to the Parquet scan, so only the selected
+        columns are read and row groups that cannot match the filters are skipped.
 
         Parameters:
             table_path (str): The path to the Delta table.
+            columns (list[str], optional): The columns to be read. Defaults to None, which reads all columns.
+            filters (list[tuple], optional): The row filters in DNF format, e.g. [('symbol', '=', 'btc')]. Defaults to None.
+            version (int, optional): The version of the Delta table to be read. Defaults to None, which reads the latest version.
 
         Returns:
-            pd.DataFrame: A DataFrame containing the data from the Delta table.
+            pa.Table: An Arrow table containing the data from the Delta table.
+        """
+        logger.info('Reading Delta table from %s.', table_path)
+        table = DeltaTable(table_path, version=version).to_pyarrow_table(
+            columns=columns, filters=filters
+        )
+        logger.info('Delta table read successfully from %s.', table_path)
+        return table
+
+    def register_delta_table(self, table_path: str, table_name: str):
         """
-        logger.info(f'Reading Delta table from {table_path}.')
-        df = DeltaTable(table_path).to_pandas()
-        logger.info(f'Delta table read successfully from {table_path}.')
-        return df
+        Registers a Delta table as a temporary view in DuckDB, without loading its data.
+
+        Queries against the view are executed by DuckDB's delta extension, which scans the Parquet
+        files in parallel and pushes column selections and filters down to the scan. The view is
+        local to this instance and is not saved in the database file.
+
+        Parameters:
+            table_path (str): The path to the Delta table.
+            table_name (str): The name of the view in DuckDB.
+        """
+        # Views cannot be prepared, so the path is passed as an escaped literal
+        self.connector.execute(
+            f'CREATE OR REPLACE TEMP VIEW "{_validate_identifier(table_name)}" AS SELECT * FROM delta_scan({_sql_literal(table_path)})'
+        )
+        logger.info(
+            "Delta table at %s registered as view '%s' in DuckDB.",
+            table_path,
+            table_name,
+        )
 
     ## Writer
 
@@ -99,45 +494,233 @@ class DataProcessing:
         table_path: str,
         write_mode: str = 'overwrite',
         schema_mode: str = 'overwrite',
-        data: pd.DataFrame = pd.DataFrame(),
+        data: pa.Table | pa.RecordBatchReader | pd.DataFrame | None = None,
+        partition_by: list[str] | None = None,
     ):
         """
-        Saves a Pandas DataFrame to a Delta table.
+        Saves an Arrow table, an Arrow record batch stream or a Pandas DataFrame to a Delta table.
+
+        The data is written as ZSTD-compressed Parquet files of roughly 128 MiB each.
 
         Parameters:
             table_path (str): The path to the Delta table.
             write_mode (str, optional): The write mode for the Delta table. Options are: 'overwrite' or 'append'. Default is 'overwrite'.
             schema_mode (str, optional): The schema mode for the Delta table. Options are: 'merge' or 'overwrite'. Default is 'overwrite'.
-            data (pd.DataFrame): The DataFrame to be saved to the Delta table.
+            data (pa.Table | pa.RecordBatchReader | pd.DataFrame): The data to be saved to the Delta table.
+                A RecordBatchReader, e.g. from run_sql_query_batched, is written batch by batch.
+            partition_by (list[str], optional): The columns the Delta table is partitioned by, e.g. the ingestion date.
+                Defaults to None, for an unpartitioned table.
+
+        Raises:
+            ValueError: If no data is provided.
         """
+        if data is None:
+            logger.error('No data provided to save to the Delta table.')
+            raise ValueError(
+                'No data provided. Please provide the data to be saved.'
+            )
+        if isinstance(data, pd.DataFrame):
+            data = pa.Table.from_pandas(data, preserve_index=False)
         logger.info(
-            f'Saving DataFrame to Delta table at {table_path} with write mode {write_mode} and schema mode {schema_mode}.'
+            'Saving DataFrame to Delta table at %s with write mode %s and schema mode %s.',
+            table_path,
+            write_mode,
+            schema_mode,
         )
         write_deltalake(
-            table_path, data, mode=write_mode, schema_mode=schema_mode
+            table_path,
+            data,
+            mode=write_mode,
+            schema_mode=schema_mode,
+            partition_by=partition_by,
+            engine='rust',
+            writer_properties=DELTA_WRITER_PROPERTIES,
+            target_file_size=DELTA_TARGET_FILE_SIZE,
         )
         logger.info(
-            f'DataFrame saved to Delta table at {table_path} successfully.'
+            'DataFrame saved to Delta table at %s successfully.', table_path
         )
 
-    def register_dataframe(self, df: pd.DataFrame, table_name: str):
+    def upsert(
+        self,
+        table_path: str,
+        data: pa.Table | pd.DataFrame,
+        keys: list[str],
+        partition_cols: list[str] | None = None,
+    ):
         """
-        Registers a Pandas DataFrame as a table in DuckDB.
+        Merges data into a Delta table, updating the rows with matching keys and inserting the others.
+
+        The merge predicate is restricted to the partition values present in the data, so only the
+        matching partitions of the Delta table are scanned and rewritten.
+
+        Parameters:
+            table_path (str): The path to the Delta table.
+            data (pa.Table | pd.DataFrame): The data to be merged into the Delta table.
+            keys (list[str]): The columns identifying a row.
+            partition_cols (list[str], optional): The partition columns of the Delta table. Defaults to None.
+        """
+        if isinstance(data, pd.DataFrame):
+            data = pa.Table.from_pandas(data, preserve_index=False)
+        if data.num_rows == 0:
+            logger.info('No data to merge into Delta table at %s.', table_path)
+            return
+        predicate = _merge_predicate(data, keys, partition_cols or [])
+        logger.info(
+            'Merging data into Delta table at %s on keys %s.', table_path, keys
+        )
+        metrics = (
+            DeltaTable(table_path)
+            .merge(
+                source=data,
+                predicate=predicate,
+                source_alias='s',
+                target_alias='t',
+                writer_properties=DELTA_WRITER_PROPERTIES,
+            )
+            .when_matched_update_all()
+            .when_not_matched_insert_all()
+            .execute()
+        )
+        logger.info(
+            'Data merged into Delta table at %s successfully: %s rows updated, %s rows inserted.',
+            table_path,
+            metrics['num_target_rows_updated'],
+            metrics['num_target_rows_inserted'],
+        )
+
+    def compact(
+        self,
+        table_path: str,
+        target_size: int = 256 << 20,
+        retention_hours: int = 168,
+    ):
+        """
+        Compacts the small files of a Delta table into larger ones and removes the files no longer referenced.
+
+        Meant to be scheduled after a number of appends, as many small files slow down both writes and scans.
+
+        Parameters:
+            table_path (str): The path to the Delta table.
+            target_size (int, optional): The target size of the compacted files in bytes. Default is 256 MiB.
+            retention_hours (int, optional): The age in hours a file must have been unreferenced before being
+                removed. Default is 168 (7 days).
+        """
+        logger.info('Compacting Delta table at %s.', table_path)
+        table = DeltaTable(table_path)
+        metrics = table.optimize.compact(
+            target_size=target_size,
+            writer_properties=DELTA_WRITER_PROPERTIES,
+        )
+        removed_files = table.vacuum(
+            retention_hours=retention_hours,
+            dry_run=False,
+            enforce_retention_duration=False,
+        )
+        logger.info(
+            'Delta table at %s compacted successfully: %s files compacted into %s, %s files vacuumed.',
+            table_path,
+            metrics['numFilesRemoved'],
+            metrics['numFilesAdded'],
+            len(removed_files),
+        )
+
+    def save_parquet(
+        self,
+        path: str,
+        data: pa.Table | pa.RecordBatchReader | pd.DataFrame,
+        compression: str = 'zstd',
+        row_group_size: int = 128 * 1024,
+    ):
+        """
+        Saves data to a single Parquet file, without the transaction log of a Delta table.
+
+        Parameters:
+            path (str): The path to the Parquet file. Paths starting with 's3://' are written to MinIO Storage.
+            data (pa.Table | pa.RecordBatchReader | pd.DataFrame): The data to be saved to the Parquet file.
+                A RecordBatchReader, e.g. from run_sql_query_batched, is written one row group at a time.
+            compression (str, optional): The compression codec of the Parquet file. Default is 'zstd'.
+            row_group_size (int, optional): The maximum number of rows per row group. Default is 131072.
+        """
+        logger.info('Saving data to Parquet file at %s.', path)
+        if isinstance(data, pd.DataFrame):
+            data = pa.Table.from_pandas(data, preserve_index=False)
+        filesystem = None
+        if path.startswith('s3://'):
+            filesystem = self._s3_filesystem
+            path = path.removeprefix('s3://')
+        options = {
+            'compression': compression,
+            'use_dictionary': True,
+            'write_statistics': True,
+            'filesystem': filesystem,
+        }
+        if isinstance(data, pa.RecordBatchReader):
+            with pq.ParquetWriter(path, data.schema, **options) as writer:
+                _write_row_groups(writer, data, row_group_size)
+        else:
+            pq.write_table(
+                data, path, row_group_size=row_group_size, **options
+            )
+        logger.info('Data saved to Parquet file at %s successfully.', path)
+
+    def register_dataframe(
+        self,
+        df: pa.Table | pd.DataFrame,
+        table_name: str,
+        materialize: bool = False,
+    ):
+        """
+        Registers an Arrow table or a Pandas DataFrame as a table in DuckDB.
+
+        By default DuckDB scans the registered buffers in place, so no copy of the data is made.
+
+        Parameters:
+            df (pa.Table | pd.DataFrame): The data to be registered.
+            table_name (str): The name of the table in DuckDB.
+            materialize (bool, optional): If True, copies the data into a native DuckDB temporary table, which is
+                compressed and faster to scan repeatedly. Like registered data, the table is private to this
+                instance and is dropped with its cursor. Default is False.
+        """
+        _validate_identifier(table_name)
+        if materialize:
+            source_name = f'_{table_name}_source'
+            self.connector.register(source_name, df)
+            try:
+                self.connector.execute(
+                    f'CREATE OR REPLACE TEMP TABLE "{table_name}" AS SELECT * FROM "{source_name}"'
+                )
+            finally:
+                self.connector.unregister(source_name)
+        else:
+            self.connector.register(table_name, df)
+        logger.info(
+            "DataFrame registered as table '%s' in DuckDB.", table_name
+        )
+
+    def persist(self, table_name: str, source_path: str):
+        """
+        Loads Parquet files into a native DuckDB table, if the table does not exist yet.
+
+        With a file-backed database, later queries scan DuckDB's compressed storage instead of decoding the Parquet files again.
 
         Parameters:
-            df (pd.DataFrame): The DataFrame to be registered.
             table_name (str): The name of the table in DuckDB.
+            source_path (str): The path or glob of the Parquet files, e.g. 's3://bucket/prices/*.parquet'.
         """
-        self.connector.register('temp_df', df)
         self.connector.execute(
-            f'CREATE TABLE {table_name} AS SELECT * FROM temp_df'
+            f'CREATE TABLE IF NOT EXISTS "{_validate_identifier(table_name)}" AS SELECT * FROM read_parquet(?)',
+            [source_path],
+        )
+        logger.info(
+            "Parquet data from %s persisted as table '%s' in DuckDB.",
+            source_path,
+            table_name,
         )
-        self.connector.unregister('temp_df')
-        logger.info(f"DataFrame registered as table '{table_name}' in DuckDB.")
 
     ## Analytical
 
-    def run_sql_query(self, query: str) -> pd.DataFrame:
+    def run_sql_query(self, query: str) -> pa.Table:
         """
         Executes a SQL query on the DuckDB connection.
 
@@ -145,9 +728,28 @@ class DataProcessing:
             query (str): The SQL query to be executed.
 
         Returns:
-            pd.DataFrame: A DataFrame containing the results of the SQL query.
+            pa.Table: An Arrow table containing the results of the SQL query.
         """
-        logger.info(f'Executing SQL query: {query}')
-        df = self.cursor.execute(query).fetchdf()
+        logger.info('Executing SQL query: %s', query)
+        table = self.connector.execute(query).fetch_arrow_table()
         logger.info('SQL query executed successfully.')
-        return df
+        return table
+
+    def run_sql_query_batched(
+        self, query: str, batch_rows: int = 100_000
+    ) -> pa.RecordBatchReader:
+        """
+        Executes a SQL query on the DuckDB connection and streams the results in record batches.
+
+        Only one batch is held in memory at a time. The reader must be consumed before another query
+        is executed on the connection.
+
+        Parameters:
+            query (str): The SQL query to be executed.
+            batch_rows (int, optional): The maximum number of rows per batch. Default is 100000.
+
+        Returns:
+            pa.RecordBatchReader: A reader yielding the results of the SQL query as Arrow record batches.
+        """
+        logger.info('Executing batched SQL query: %s', query)
+        return self.connector.execute(query).fetch_record_batch(batch_rows)
@@ -1,21 +1,17 @@
 import logging
-import os
+from collections.abc import Iterable
 from io import BytesIO
-from typing import Protocol
+from typing import BinaryIO, Protocol
 
-from dotenv import load_dotenv
 from minio import Minio
 
-# Configure the logger with timestamp
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S',
-)
+from .config import get_env
+
 logger = logging.getLogger(__name__)
 
-#Load environment variables
-load_dotenv()
+# Size of each part of a multipart upload to MinIO
+UPLOAD_PART_SIZE = 16 << 20
+
 
 class StorageInterface(Protocol):
     """
@@ -39,9 +35,9 @@ class StorageInterface(Protocol):
         self,
         bucket_name: str,
         object_name: str,
-        data: object,
-        length: int,
-        content_type: str,
+        data: bytes | BinaryIO | Iterable[bytes],
+        length: int = -1,
+        content_type: str = 'application/octet-stream',
     ) -> None:
         pass
 
@@ -49,6 +45,31 @@ class StorageInterface(Protocol):
         pass
 
 
+class ChunkStream:
+    """
+    A read-only file-like object over an iterable of bytes chunks, so it can be streamed to MinIO.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._buffer = bytearray()
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Reads up to 'size' bytes from the chunks, or all the remaining bytes if 'size' is negative.
+        """
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer.extend(chunk)
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+
 class LocalStorage:
     """
     Implementation of the storage interface for local storage.
@@ -56,13 +77,33 @@ class LocalStorage:
 
     def __init__(self):
         self.minio_client = Minio(
-            endpoint=os.getenv('MINIO_ENDPOINT'),
-            access_key=os.getenv('MINIO_ACCESS_KEY'),
-            secret_key=os.getenv('MINIO_SECRET_KEY'),
+            endpoint=get_env('MINIO_ENDPOINT'),
+            access_key=get_env('MINIO_ACCESS_KEY'),
+            secret_key=get_env('MINIO_SECRET_KEY'),
             secure=False,
         )
+        self._known_buckets: set[str] = set()
         logger.info('Minio client initialized.')
 
+    def _bucket_exists(self, bucket_name: str) -> bool:
+        """
+        Checks whether a bucket exists on MinIO Storage.
+
+        Buckets found once are remembered, so later checks skip the round-trip to MinIO.
+
+        Parameters:
+            bucket_name (str): The bucket name.
+
+        Returns:
+            bool: True if the bucket exists.
+        """
+        if bucket_name in self._known_buckets:
+            return True
+        found = self.minio_client.bucket_exists(bucket_name)
+        if found:
+            self._known_buckets.add(bucket_name)
+        return found
+
     def create_bucket(self, bucket_name: str) -> None:
         """
         Creates a bucket on MinIO Storage.
@@ -73,44 +114,60 @@ class LocalStorage:
         Returns:
             None
         """
-        found = self.minio_client.bucket_exists(bucket_name)
+        found = self._bucket_exists(bucket_name)
         if not found:
             self.minio_client.make_bucket(bucket_name)
-            logger.info(f"Bucket '{bucket_name}' created.")
+            self._known_buckets.add(bucket_name)
+            logger.info("Bucket '%s' created.", bucket_name)
         else:
-            logger.info(f"Bucket '{bucket_name}' already exists.")
+            logger.info("Bucket '%s' already exists.", bucket_name)
 
     def save_raw_data(
         self,
         bucket_name: str,
         object_name: str,
-        data: object,
-        length: int,
-        content_type: str,
+        data: bytes | BinaryIO | Iterable[bytes],
+        length: int = -1,
+        content_type: str = 'application/octet-stream',
     ) -> None:
         """
         Saves a raw data to specified bucket in MinIO Storage.
 
+        The data is streamed to MinIO in parts, so it does not need to be fully loaded in memory
+        nor its size known in advance.
+
         Parameters:
             bucket_name (str): The name of the bucket where the data will be saved.
             object_name (str): The name of the object to be saved within the bucket (full path).
-            data (object): The data to be saved, converted to a format compatible with BinaryIO.
-            length (int): The size of the data in bytes.
-            content_type (str): The content type of the file (e.g., 'application/json').
+            data (bytes | BinaryIO | Iterable[bytes]): The data to be saved, as bytes, a file-like object or an iterable
+                of bytes chunks (e.g. 'requests.Response.iter_content()').
+            length (int, optional): The size of the data in bytes. Default is -1, for an unknown size.
+            content_type (str, optional): The content type of the file (e.g., 'application/json'). Default is 'application/octet-stream'.
 
         Returns:
             None
         """
-        found = self.minio_client.bucket_exists(bucket_name)
+        found = self._bucket_exists(bucket_name)
         if not found:
-            logger.error(f"Bucket '{bucket_name}' does not exist.")
+            logger.error("Bucket '%s' does not exist.", bucket_name)
             raise Exception('Bucket does not exist.')
         else:
+            if isinstance(data, (bytes, bytearray)):
+                if length < 0:
+                    length = len(data)
+                data = BytesIO(data)
+            elif not hasattr(data, 'read'):
+                data = ChunkStream(data)
             self.minio_client.put_object(
-                bucket_name, object_name, data, length, content_type
+                bucket_name,
+                object_name,
+                data,
+                length,
+                content_type,
+                part_size=UPLOAD_PART_SIZE,
             )
             logger.info(
-                f"Object '{object_name}' saved to bucket '{bucket_name}'."
+                "Object '%s' saved to bucket '%s'.", object_name, bucket_name
             )
 
     def get_object_data(self, bucket_name: str, object_name: str) -> BytesIO:
@@ -124,9 +181,9 @@ class LocalStorage:
         Returns:
             BytesIO: The object data as a file-like object.
         """
-        found = self.minio_client.bucket_exists(bucket_name)
+        found = self._bucket_exists(bucket_name)
         if not found:
-            logger.error(f"Bucket '{bucket_name}' does not exist.")
+            logger.error("Bucket '%s' does not exist.", bucket_name)
             raise Exception('Bucket does not exist.')
         else:
             logger.info('Retrieving object from MinIO Storage.')
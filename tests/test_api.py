@@ -0,0 +1,159 @@
+import json
+import threading
+
+import pytest
+import requests
+
+from crypto_data_ingestion.api import CoinGeckoAPIClient
+
+
+class StubSession:
+    """
+    Stand-in for requests.Session, returning canned responses and recording the request headers.
+    """
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.headers = []
+
+    def get(self, url, headers=None, params=None):
+        self.headers.append(headers)
+        return self.responses.pop(0)
+
+    def close(self):
+        pass
+
+
+class URLStubSession(StubSession):
+    """
+    Stand-in for requests.Session, returning the canned response of each URL, whatever the request order.
+
+    Each request waits at the barrier, so the requests only complete if they are in flight together.
+    """
+
+    def __init__(self, responses, barrier):
+        self.responses = responses
+        self.barrier = barrier
+        self.urls = []
+        self.lock = threading.Lock()
+
+    def get(self, url, headers=None, params=None):
+        with self.lock:
+            self.urls.append(url)
+        self.barrier.wait(timeout=5)
+        return self.responses[url]
+
+
+def make_response(status_code, payload=None, etag=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(payload).encode() if payload else b''
+    if etag:
+        response.headers['ETag'] = etag
+    return response
+
+
+@pytest.fixture(autouse=True)
+def api_url(monkeypatch):
+    monkeypatch.setenv('COINGECKO_API_URL', 'https://api.example.com')
+
+
+def test_not_modified_returns_cached_payload():
+    client = CoinGeckoAPIClient()
+    client.session = StubSession(
+        [
+            make_response(200, {'bitcoin': 1}, etag='"v1"'),
+            make_response(304),
+        ]
+    )
+
+    assert client.get_data('simple/price', {'ids': 'bitcoin'}) == {
+        'bitcoin': 1
+    }
+    assert client.get_data('simple/price', {'ids': 'bitcoin'}) == {
+        'bitcoin': 1
+    }
+    assert 'If-None-Match' not in client.session.headers[0]
+    assert client.session.headers[1]['If-None-Match'] == '"v1"'
+
+
+def test_cached_payload_is_not_shared_with_callers():
+    client = CoinGeckoAPIClient()
+    client.session = StubSession(
+        [
+            make_response(200, {'bitcoin': {'usd': 1}}, etag='"v1"'),
+            make_response(304),
+            make_response(304),
+        ]
+    )
+
+    client.get_data('simple/price')['bitcoin']['usd'] = 2
+    client.get_data('simple/price')['bitcoin']['usd'] = 3
+
+    assert client.get_data('simple/price') == {'bitcoin': {'usd': 1}}
+
+
+def test_cache_is_keyed_by_query_parameters():
+    client = CoinGeckoAPIClient()
+    client.session = StubSession(
+        [
+            make_response(200, {'bitcoin': 1}, etag='"v1"'),
+            make_response(200, {'ethereum': 2}, etag='"v2"'),
+        ]
+    )
+
+    client.get_data('simple/price', {'ids': 'bitcoin'})
+
+    assert client.get_data('simple/price', {'ids': 'ethereum'}) == {
+        'ethereum': 2
+    }
+    assert 'If-None-Match' not in client.session.headers[1]
+
+
+def test_responses_without_etag_are_not_cached():
+    client = CoinGeckoAPIClient()
+    client.session = StubSession(
+        [make_response(200, {'gecko_says': 'ok'})] * 2
+    )
+
+    client.get_data('ping')
+    client.get_data('ping')
+
+    assert 'If-None-Match' not in client.session.headers[1]
+
+
+def test_cache_is_persisted_to_cache_path(tmp_path):
+    cache_path = str(tmp_path / 'etags')
+    client = CoinGeckoAPIClient(cache_path=cache_path)
+    client.session = StubSession(
+        [make_response(200, {'gecko_says': 'ok'}, etag='"v1"')]
+    )
+    client.get_data('ping')
+    client.close()
+
+    client = CoinGeckoAPIClient(cache_path=cache_path)
+    client.session = StubSession([make_response(304)])
+
+    assert client.get_data('ping') == {'gecko_says': 'ok'}
+    client.close()
+
+
+def test_get_data_many_fans_out_and_keeps_endpoint_order():
+    endpoints = [f'coins/{coin}' for coin in ['bitcoin', 'ethereum', 'tether']]
+    client = CoinGeckoAPIClient(max_workers=3)
+    client.session = URLStubSession(
+        {
+            f'https://api.example.com/{endpoint}': make_response(
+                200, {'id': endpoint}
+            )
+            for endpoint in endpoints
+        },
+        threading.Barrier(len(endpoints)),
+    )
+
+    results = client.get_data_many(
+        [(endpoint, None) for endpoint in reversed(endpoints)]
+    )
+
+    assert results == [{'id': endpoint} for endpoint in reversed(endpoints)]
+    assert sorted(client.session.urls) == sorted(client.session.responses)
@@ -0,0 +1,347 @@
+import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import duckdb
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from deltalake import DeltaTable
+
+from crypto_data_ingestion import data_operations
+from crypto_data_ingestion.data_operations import (
+    DataProcessing,
+    _merge_predicate,
+    _prefix_glob,
+    _validate_identifier,
+)
+
+
+@pytest.fixture
+def processing():
+    return DataProcessing(storage=None, connection=duckdb.connect())
+
+
+@pytest.fixture
+def shared_databases(monkeypatch):
+    """
+    Isolates the process-wide connections, with slow and unavailable extensions.
+    """
+
+    def load_extension(connection, extension):
+        time.sleep(0.05)
+        return False
+
+    monkeypatch.setattr(data_operations, '_connections', {})
+    monkeypatch.setattr(data_operations, '_load_extension', load_extension)
+
+
+def test_merge_predicate_matches_keys():
+    data = pa.table({'id': ['btc'], 'price': [1.0]})
+
+    assert _merge_predicate(data, ['id'], []) == 't."id" = s."id"'
+
+
+def test_merge_predicate_restricts_partitions_to_source_values():
+    data = pa.table(
+        {
+            'id': ['btc', 'eth', 'btc'],
+            'day': ['2024-10-01', '2024-10-02', '2024-10-01'],
+        }
+    )
+
+    assert _merge_predicate(data, ['id'], ['day']) == (
+        't."id" = s."id" AND t."day" IN (\'2024-10-01\', \'2024-10-02\')'
+    )
+
+
+def test_merge_predicate_matches_null_partitions():
+    data = pa.table({'id': ['btc', 'eth'], 'day': ['2024-10-01', None]})
+
+    assert _merge_predicate(data, ['id'], ['day']) == (
+        't."id" = s."id" AND (t."day" IN (\'2024-10-01\') OR t."day" IS NULL)'
+    )
+
+
+def test_merge_predicate_with_only_null_partitions():
+    data = pa.table({'id': ['btc'], 'day': pa.array([None], pa.string())})
+
+    assert _merge_predicate(data, ['id'], ['day']) == (
+        't."id" = s."id" AND (false OR t."day" IS NULL)'
+    )
+
+
+def test_merge_predicate_formats_non_finite_floats():
+    data = pa.table({'id': [1, 2], 'bucket': [float('nan'), float('inf')]})
+
+    assert _merge_predicate(data, ['id'], ['bucket']) == (
+        't."id" = s."id" AND t."bucket" IN '
+        "(CAST('nan' AS DOUBLE), CAST('inf' AS DOUBLE))"
+    )
+
+
+def test_upsert_updates_and_inserts_within_partitions(processing, tmp_path):
+    table_path = str(tmp_path / 'prices')
+    day = datetime.date(2024, 10, 1)
+    processing.save_delta_table(
+        table_path,
+        data=pa.table(
+            {
+                'id': ['btc', 'eth', 'btc'],
+                'day': [day, day, datetime.date(2024, 10, 2)],
+                'price': [1.0, 2.0, 3.0],
+            }
+        ),
+        partition_by=['day'],
+    )
+
+    processing.upsert(
+        table_path,
+        pa.table(
+            {'id': ['btc', 'sol'], 'day': [day, day], 'price': [10.0, 5.0]}
+        ),
+        keys=['id', 'day'],
+        partition_cols=['day'],
+    )
+
+    rows = processing.read_delta_table(table_path).sort_by(
+        [('id', 'ascending'), ('day', 'ascending')]
+    )
+    assert rows.to_pydict() == {
+        'id': ['btc', 'btc', 'eth', 'sol'],
+        'day': [day, datetime.date(2024, 10, 2), day, day],
+        'price': [10.0, 3.0, 2.0, 5.0],
+    }
+
+
+@pytest.mark.parametrize('name', ['prices', '_tmp', 'Coin_2024'])
+def test_valid_identifiers_are_accepted(name):
+    assert _validate_identifier(name) == name
+
+
+@pytest.mark.parametrize(
+    'name',
+    [
+        '',
+        '2024_prices',
+        'coin prices',
+        'prices; DROP TABLE coins',
+        'prices"',
+        'main.prices',
+        'a' * 64,
+    ],
+)
+def test_invalid_identifiers_are_rejected(name):
+    with pytest.raises(ValueError, match='Invalid identifier'):
+        _validate_identifier(name)
+
+
+def test_register_dataframe_rejects_invalid_table_name(processing):
+    with pytest.raises(ValueError, match='Invalid identifier'):
+        processing.register_dataframe(
+            pa.table({'a': [1]}), 'prices; DROP TABLE coins'
+        )
+
+
+def test_upsert_rejects_invalid_key(processing, tmp_path):
+    with pytest.raises(ValueError, match='Invalid identifier'):
+        processing.upsert(
+            str(tmp_path / 'prices'),
+            pa.table({'id': ['btc']}),
+            keys=['id" OR true --'],
+        )
+
+
+def test_instances_share_one_database(shared_databases):
+    first = DataProcessing(storage=None)
+    second = DataProcessing(storage=None)
+    first.connector.execute('CREATE TABLE prices AS SELECT 1 AS a')
+
+    assert first.connection is second.connection
+    assert first.connector is not second.connector
+    assert second.run_sql_query('SELECT * FROM prices').num_rows == 1
+
+
+def test_instances_created_concurrently_share_one_database(shared_databases):
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        instances = list(
+            executor.map(lambda _: DataProcessing(storage=None), range(16))
+        )
+
+    assert len({id(instance.connection) for instance in instances}) == 1
+
+
+def test_settings_apply_to_the_shared_database(shared_databases):
+    DataProcessing(storage=None, threads=2, memory_limit='1GB')
+    processing = DataProcessing(storage=None)
+
+    settings = processing.run_sql_query(
+        "SELECT current_setting('threads') AS threads, current_setting('memory_limit') AS memory_limit"
+    ).to_pylist()
+    assert settings == [{'threads': 2, 'memory_limit': '953.6 MiB'}]
+
+
+def test_in_memory_names_are_not_treated_as_paths(
+    shared_databases, tmp_path, monkeypatch
+):
+    monkeypatch.chdir(tmp_path)
+    default = DataProcessing(storage=None)
+    memory = DataProcessing(storage=None, db_path=':memory:')
+    named = DataProcessing(storage=None, db_path=':memory:prices')
+
+    assert default.connection is memory.connection
+    assert named.connection is not memory.connection
+    assert set(data_operations._connections) == {':memory:', ':memory:prices'}
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_relative_db_paths_share_one_database(
+    shared_databases, tmp_path, monkeypatch
+):
+    monkeypatch.chdir(tmp_path)
+    relative = DataProcessing(storage=None, db_path='prices.duckdb')
+    absolute = DataProcessing(
+        storage=None, db_path=str(tmp_path / 'prices.duckdb')
+    )
+
+    assert relative.connection is absolute.connection
+
+
+def test_materialized_tables_are_private_to_each_instance(shared_databases):
+    first = DataProcessing(storage=None)
+    second = DataProcessing(storage=None)
+
+    first.register_dataframe(pa.table({'a': [1]}), 'prices', materialize=True)
+    second.register_dataframe(
+        pa.table({'a': [2, 3]}), 'prices', materialize=True
+    )
+    first.register_dataframe(
+        pa.table({'a': [4, 5, 6]}), 'prices', materialize=True
+    )
+
+    assert first.run_sql_query('SELECT * FROM prices').num_rows == 3
+    assert second.run_sql_query('SELECT * FROM prices').num_rows == 2
+
+
+def test_registered_dataframes_are_private_to_each_instance(
+    shared_databases,
+):
+    first = DataProcessing(storage=None)
+    second = DataProcessing(storage=None)
+    first.register_dataframe(pa.table({'a': [1]}), 'prices')
+
+    assert first.run_sql_query('SELECT * FROM prices').num_rows == 1
+    with pytest.raises(duckdb.CatalogException):
+        second.run_sql_query('SELECT * FROM prices')
+
+
+def test_insertion_order_is_disabled_once_per_database(shared_databases):
+    processing = DataProcessing(storage=None)
+    query = "SELECT current_setting('preserve_insertion_order') AS value"
+
+    assert processing.run_sql_query(query).to_pylist() == [{'value': False}]
+
+    DataProcessing(storage=None, preserve_insertion_order=True)
+    DataProcessing(storage=None)
+
+    assert processing.run_sql_query(query).to_pylist() == [{'value': True}]
+
+
+@pytest.mark.parametrize(
+    'prefix, expected',
+    [
+        ('', 's3://raw/**/*.json'),
+        ('/', 's3://raw/**/*.json'),
+        ('a', 's3://raw/a/**/*.json'),
+        ('a/', 's3://raw/a/**/*.json'),
+    ],
+)
+def test_prefix_glob(prefix, expected):
+    assert _prefix_glob('raw', prefix, 'json') == expected
+
+
+@pytest.mark.parametrize('method', ['read_raw_data', 'read_prefix'])
+def test_readers_reject_unsupported_extensions(processing, method):
+    with pytest.raises(ValueError, match='Invalid file extension'):
+        getattr(processing, method)('xlsx', 'raw', 'prices')
+
+
+def row_group_sizes(path):
+    metadata = pq.ParquetFile(path).metadata
+    return [
+        metadata.row_group(index).num_rows
+        for index in range(metadata.num_row_groups)
+    ]
+
+
+def test_save_parquet_writes_a_table(processing, tmp_path):
+    path = str(tmp_path / 'prices.parquet')
+    table = pa.table({'price': list(range(25))})
+
+    processing.save_parquet(path, table, row_group_size=10)
+
+    assert pq.read_table(path).equals(table)
+    assert row_group_sizes(path) == [10, 10, 5]
+
+
+def test_save_parquet_buffers_batches_into_row_groups(processing, tmp_path):
+    path = str(tmp_path / 'prices.parquet')
+    table = pa.table({'price': list(range(25))})
+    reader = pa.RecordBatchReader.from_batches(
+        table.schema, table.to_batches(max_chunksize=3)
+    )
+
+    processing.save_parquet(path, reader, row_group_size=10)
+
+    assert pq.read_table(path).equals(table)
+    assert row_group_sizes(path) == [10, 10, 5]
+
+
+def test_persist_loads_parquet_files_once(processing, tmp_path):
+    path = str(tmp_path / 'prices.parquet')
+    processing.save_parquet(path, pa.table({'price': [1, 2]}))
+
+    processing.persist('prices', path)
+    processing.save_parquet(path, pa.table({'price': [3]}))
+    processing.persist('prices', path)
+
+    assert processing.run_sql_query('SELECT * FROM prices').to_pylist() == [
+        {'price': 1},
+        {'price': 2},
+    ]
+
+
+def test_persisted_tables_are_kept_in_the_database_file(
+    shared_databases, tmp_path
+):
+    db_path = str(tmp_path / 'prices.duckdb')
+    path = str(tmp_path / 'prices.parquet')
+    processing = DataProcessing(storage=None, db_path=db_path)
+    processing.save_parquet(path, pa.table({'price': [1, 2]}))
+    processing.persist('prices', path)
+    processing.connection.close()
+    data_operations._connections.clear()
+
+    processing = DataProcessing(storage=None, db_path=db_path)
+
+    assert processing.run_sql_query('SELECT * FROM prices').num_rows == 2
+
+
+def test_compact_merges_small_files_and_vacuums_them(processing, tmp_path):
+    table_path = str(tmp_path / 'prices')
+    for price in range(4):
+        processing.save_delta_table(
+            table_path,
+            write_mode='append',
+            schema_mode='merge',
+            data=pa.table({'price': [price]}),
+        )
+
+    processing.compact(table_path, retention_hours=0)
+
+    parquet_files = list((tmp_path / 'prices').glob('*.parquet'))
+    assert len(parquet_files) == 1
+    assert DeltaTable(table_path).files() == [parquet_files[0].name]
+    assert sorted(
+        processing.read_delta_table(table_path)['price'].to_pylist()
+    ) == [0, 1, 2, 3]
@@ -0,0 +1,103 @@
+import pytest
+
+from crypto_data_ingestion.storage import ChunkStream, LocalStorage
+
+
+class StubMinioClient:
+    """
+    In-memory stand-in for the Minio client, recording the calls made to it.
+    """
+
+    def __init__(self, buckets=()):
+        self.buckets = set(buckets)
+        self.bucket_exists_calls = 0
+        self.uploads = []
+
+    def bucket_exists(self, bucket_name):
+        self.bucket_exists_calls += 1
+        return bucket_name in self.buckets
+
+    def make_bucket(self, bucket_name):
+        self.buckets.add(bucket_name)
+
+    def put_object(
+        self, bucket_name, object_name, data, length, content_type, **kwargs
+    ):
+        self.uploads.append(
+            (bucket_name, object_name, data.read(), length, content_type)
+        )
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    monkeypatch.setenv('MINIO_ENDPOINT', 'localhost:9000')
+    monkeypatch.setenv('MINIO_ACCESS_KEY', 'access')
+    monkeypatch.setenv('MINIO_SECRET_KEY', 'secret')
+    storage = LocalStorage()
+    storage.minio_client = StubMinioClient(buckets={'raw'})
+    return storage
+
+
+def test_chunk_stream_reads_across_chunk_boundaries():
+    stream = ChunkStream([b'ab', b'cdef', b'g'])
+
+    assert stream.read(3) == b'abc'
+    assert stream.read(3) == b'def'
+    assert stream.read(3) == b'g'
+    assert stream.read(3) == b''
+
+
+def test_chunk_stream_skips_empty_chunks():
+    stream = ChunkStream([b'', b'ab', b'', b'', b'c', b''])
+
+    assert stream.read(2) == b'ab'
+    assert stream.read(2) == b'c'
+    assert stream.read(2) == b''
+
+
+def test_chunk_stream_reads_everything_with_negative_size():
+    stream = ChunkStream([b'ab', b'cd'])
+
+    assert stream.read(1) == b'a'
+    assert stream.read() == b'bcd'
+    assert stream.read() == b''
+
+
+def test_save_raw_data_streams_chunk_iterables(storage):
+    storage.save_raw_data('raw', 'coins.json', iter([b'{"a"', b': 1}']))
+
+    assert storage.minio_client.uploads == [
+        ('raw', 'coins.json', b'{"a": 1}', -1, 'application/octet-stream')
+    ]
+
+
+def test_save_raw_data_accepts_bytes(storage):
+    storage.save_raw_data(
+        'raw', 'coins.json', b'{"a": 1}', content_type='application/json'
+    )
+
+    assert storage.minio_client.uploads == [
+        ('raw', 'coins.json', b'{"a": 1}', 8, 'application/json')
+    ]
+
+
+def test_known_bucket_is_checked_once(storage):
+    storage.save_raw_data('raw', 'a.json', b'{}')
+    storage.save_raw_data('raw', 'b.json', b'{}')
+
+    assert storage.minio_client.bucket_exists_calls == 1
+
+
+def test_created_bucket_is_not_checked_again(storage):
+    storage.create_bucket('curated')
+    storage.save_raw_data('curated', 'a.json', b'{}')
+
+    assert storage.minio_client.bucket_exists_calls == 1
+
+
+def test_missing_bucket_is_checked_every_time(storage):
+    for _ in range(2):
+        with pytest.raises(Exception, match='Bucket does not exist.'):
+            storage.save_raw_data('missing', 'a.json', b'{}')
+
+    assert storage.minio_client.bucket_exists_calls == 2